@@ -4,6 +4,13 @@ from typing import List
 
 # Database configuration
 DATABASE_NAME: str = "emails.db"
+SQLITE_PRAGMAS: str = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-65536;
+    PRAGMA mmap_size=268435456;
+"""
 
 # Gmail API configuration
 GMAIL_SCOPES: List[str] = ["https://www.googleapis.com/auth/gmail.readonly"]
@@ -13,6 +20,14 @@ CREDENTIALS_PATH: str = "config/credentials.json"
 TOKEN_PATH: str = "token.pickle"
 DEFAULT_RULES_PATH: str = "rules.json"
 
+# Rule SQL filters
+# Matches values holding a non-ASCII character that str.lower() turns into an
+# ASCII letter ("\u0130" to "i", the Kelvin sign to "k"). SQLite's LIKE cannot
+# fold these, so rule filters on "i" or "k" also accept such values.
+ASCII_FOLD_GLOB: str = "*[\u0130\u212a]*"
+
 # Gmail API defaults
 DEFAULT_USER: str = "me"
 DEFAULT_MAX_RESULTS: int = 10
+GMAIL_BATCH_SIZE: int = 50  # Gmail recommends at most 50 calls per batch
+GMAIL_METADATA_HEADERS: List[str] = ["From", "Subject", "Date"]
@@ -1,35 +1,131 @@
+import atexit
 import sqlite3
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
-from ..constants import DATABASE_NAME
+from ..constants import ASCII_FOLD_GLOB, DATABASE_NAME, SQLITE_PRAGMAS
+
+
+def _connect(db_name: str) -> sqlite3.Connection:
+    """Open an autocommit connection tuned for a local single-writer workload."""
+    conn = sqlite3.connect(db_name, isolation_level=None, check_same_thread=False)
+    conn.executescript(SQLITE_PRAGMAS)
+    return conn
 
 
 class Database:
-    """Database connection manager."""
+    """Process-wide database connection manager.
+
+    A single connection is opened lazily and reused by every query, so the
+    SQLite page cache survives between calls instead of being rebuilt for
+    each open/close cycle.
 
-    def __init__(self, db_name: str = DATABASE_NAME):
-        self.db_name = db_name
-        self.conn: Optional[sqlite3.Connection] = None
+    Class Attributes:
+        db_name: Path of the SQLite database file
+        _conn: Shared connection instance
+    """
+
+    db_name: str = DATABASE_NAME
+    _conn: Optional[sqlite3.Connection] = None
 
-    def connect(self) -> sqlite3.Connection:
-        """Create a database connection."""
-        if not self.conn:
-            self.conn = sqlite3.connect(self.db_name)
-        return self.conn
+    @classmethod
+    def get_conn(cls) -> sqlite3.Connection:
+        """Get or create the shared database connection.
 
-    def close(self) -> None:
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        Returns:
+            sqlite3.Connection: The shared database connection
+        """
+        if cls._conn is None:
+            cls._conn = _connect(cls.db_name)
+        return cls._conn
 
-    def __enter__(self) -> sqlite3.Connection:
-        """Context manager entry."""
-        return self.connect()
+    @classmethod
+    @contextmanager
+    def transaction(cls) -> Iterator[sqlite3.Connection]:
+        """Group the enclosed statements into a single transaction.
 
-    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Context manager exit."""
-        self.close()
+        Commits when the block exits normally and rolls back if it raises.
+        Inside an already open transaction the block runs as a savepoint, so
+        it only commits or rolls back as part of the outer transaction.
+
+        Yields:
+            sqlite3.Connection: The shared database connection
+        """
+        conn = cls.get_conn()
+        if conn.in_transaction:
+            conn.execute("SAVEPOINT nested_transaction")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK TO nested_transaction")
+                conn.execute("RELEASE nested_transaction")
+                raise
+            conn.execute("RELEASE nested_transaction")
+            return
+
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    @classmethod
+    def close(cls) -> None:
+        """Close the shared database connection."""
+        if cls._conn is not None:
+            cls._conn.close()
+            cls._conn = None
+
+
+atexit.register(Database.close)
+
+
+def _create_fulltext_index(conn: sqlite3.Connection) -> None:
+    """Create a trigram FTS5 index over the free-text email columns.
+
+    The index is an external-content table kept in sync with ``emails`` by
+    triggers; it lets substring (LIKE '%needle%') rule filters use an index
+    instead of scanning every row. Skipped when the SQLite build lacks FTS5
+    or its trigram tokenizer.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'emails_fts'")
+    if cursor.fetchone():
+        return
+    try:
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE emails_fts USING fts5(
+                sender, subject, snippet,
+                content='emails', content_rowid='id', tokenize='trigram'
+            )
+        """
+        )
+    except sqlite3.OperationalError:
+        return
+    cursor.executescript(
+        """
+        CREATE TRIGGER emails_fts_insert AFTER INSERT ON emails BEGIN
+            INSERT INTO emails_fts(rowid, sender, subject, snippet)
+            VALUES (new.id, new.sender, new.subject, new.snippet);
+        END;
+        CREATE TRIGGER emails_fts_delete AFTER DELETE ON emails BEGIN
+            INSERT INTO emails_fts(emails_fts, rowid, sender, subject, snippet)
+            VALUES ('delete', old.id, old.sender, old.subject, old.snippet);
+        END;
+        CREATE TRIGGER emails_fts_update
+        AFTER UPDATE OF sender, subject, snippet ON emails BEGIN
+            INSERT INTO emails_fts(emails_fts, rowid, sender, subject, snippet)
+            VALUES ('delete', old.id, old.sender, old.subject, old.snippet);
+            INSERT INTO emails_fts(rowid, sender, subject, snippet)
+            VALUES (new.id, new.sender, new.subject, new.snippet);
+        END;
+        -- Index emails stored before the full-text table existed.
+        INSERT INTO emails_fts(emails_fts) VALUES ('rebuild');
+    """
+    )
 
 
 def init_db(db_name: str = DATABASE_NAME) -> sqlite3.Connection:
@@ -38,7 +134,7 @@ def init_db(db_name: str = DATABASE_NAME) -> sqlite3.Connection:
     Returns:
         sqlite3.Connection: The database connection
     """
-    conn = sqlite3.connect(db_name)
+    conn = _connect(db_name)
     cursor = conn.cursor()
     cursor.execute(
         """
@@ -54,5 +150,24 @@ def init_db(db_name: str = DATABASE_NAME) -> sqlite3.Connection:
         )
     """
     )
+    # Expression index backing the julianday() date filters used when rules
+    # are pushed down to SQL.
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_emails_date_received
+        ON emails(julianday(date_received))
+    """
+    )
+    # Partial indexes over the few rows with characters LIKE cannot case fold,
+    # so the matching OR branch of a rule filter reads an index, not the table.
+    # The filter must repeat each WHERE expression exactly for SQLite to use it.
+    for column in ("sender", "subject", "snippet"):
+        cursor.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS idx_emails_{column}_ascii_folds
+            ON emails(id) WHERE {column} GLOB '{ASCII_FOLD_GLOB}'
+        """
+        )
+    _create_fulltext_index(conn)
     conn.commit()
     return conn
@@ -1,9 +1,12 @@
+import logging
 import sqlite3
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 from .database import Database
 
+logger = logging.getLogger(__name__)
+
 
 def insert_email(
     message_id: str,
@@ -14,63 +17,172 @@ def insert_email(
     folder: str = "INBOX",
     is_read: bool = False,
 ) -> bool:
-    """Insert a new email into the database."""
-    with Database() as conn:
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO emails
-                (message_id, sender, subject, date_received, snippet, folder, is_read)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    message_id,
-                    sender,
-                    subject,
-                    date_received,
-                    snippet,
-                    folder,
-                    1 if is_read else 0,
-                ),
-            )
-            conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False
-
-
-def get_all_emails() -> List[Dict[str, Any]]:
-    """Retrieve all emails from the database."""
-    with Database() as conn:
+    """Insert a new email into the database.
+
+    Returns:
+        bool: True if the email was inserted, False if it already existed
+    """
+    conn = Database.get_conn()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT OR IGNORE INTO emails
+        (message_id, sender, subject, date_received, snippet, folder, is_read)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            message_id,
+            sender,
+            subject,
+            date_received,
+            snippet,
+            folder,
+            1 if is_read else 0,
+        ),
+    )
+    return cursor.rowcount == 1
+
+
+def insert_emails_bulk(rows: List[Tuple[Any, ...]]) -> int:
+    """
+    Insert many emails into the database inside a single transaction.
+
+    Args:
+        rows: Tuples of (message_id, sender, subject, date_received, snippet,
+            folder, is_read)
+
+    Returns:
+        int: Number of rows actually inserted; duplicates are ignored
+    """
+    with Database.transaction() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT id, message_id, sender, subject, date_received, snippet,
-                   folder, is_read
-            FROM emails
+        cursor.executemany(
             """
+            INSERT OR IGNORE INTO emails
+            (message_id, sender, subject, date_received, snippet, folder, is_read)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
         )
-        rows = cursor.fetchall()
-        return [
-            {
-                "id": row[0],
-                "message_id": row[1],
-                "sender": row[2],
-                "subject": row[3],
-                "date_received": datetime.fromisoformat(row[4]),
-                "snippet": row[5],
-                "folder": row[6],
-                "is_read": bool(row[7]),
-            }
-            for row in rows
-        ]
+    return cursor.rowcount
+
+
+def get_existing_message_ids(message_ids: Iterable[str]) -> Set[str]:
+    """Return the subset of the given message IDs already stored."""
+    ids = list(message_ids)
+    if not ids:
+        return set()
+    placeholders = ", ".join("?" * len(ids))
+    conn = Database.get_conn()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT message_id FROM emails WHERE message_id IN ({placeholders})",
+        ids,
+    )
+    return {row[0] for row in cursor}
+
+
+_EMAIL_COLUMNS = """
+    id, message_id, sender, subject, date_received, snippet, folder, is_read
+"""
+
+
+def _row_to_email(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a row selected with _EMAIL_COLUMNS into an email dict."""
+    email = dict(row)
+    email["date_received"] = datetime.fromisoformat(email["date_received"])
+    email["is_read"] = bool(email["is_read"])
+    return email
+
+
+def _select_emails(
+    where: str = "1", params: Sequence[Any] = (), limit: Optional[int] = None
+) -> sqlite3.Cursor:
+    """Run an email SELECT on a cursor yielding sqlite3.Row objects."""
+    sql = f"SELECT {_EMAIL_COLUMNS} FROM emails WHERE {where} ORDER BY id"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params = (*params, limit)
+    cursor = Database.get_conn().cursor()
+    cursor.row_factory = sqlite3.Row  # type: ignore[assignment]
+    return cursor.execute(sql, params)
+
+
+def get_all_emails(limit: Optional[int] = None) -> Iterator[sqlite3.Row]:
+    """
+    Retrieve emails from the database.
+
+    Rows are streamed from the cursor as sqlite3.Row objects, which support
+    both index and column-name access without building a dict per row;
+    ``date_received`` is the stored text and ``is_read`` the stored integer.
+
+    Args:
+        limit: Maximum number of emails to return, or None for all of them
+
+    Returns:
+        Iterator[sqlite3.Row]: The emails, ordered by ID
+    """
+    return _select_emails(limit=limit)
+
+
+# Constant SQL text, so sqlite3's statement cache reuses the prepared statement.
+_LISTING_SQL = """
+    SELECT id, sender, subject, date_received, folder, is_read
+    FROM emails ORDER BY id LIMIT ?
+"""
+
+
+def get_email_listing(limit: Optional[int] = None) -> sqlite3.Cursor:
+    """
+    Retrieve the columns shown in the email listing.
+
+    Args:
+        limit: Maximum number of emails to return, or None for all of them
+
+    Returns:
+        sqlite3.Cursor: Plain (id, sender, subject, date_received, folder,
+        is_read) tuples, ordered by ID
+    """
+    cursor = Database.get_conn().cursor()
+    return cursor.execute(_LISTING_SQL, (-1 if limit is None else limit,))
+
+
+def get_emails_matching(where: str, params: Sequence[Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Retrieve the emails satisfying a SQL filter.
+
+    Args:
+        where: Parameterized SQL expression used as the WHERE clause
+        params: Values bound to the placeholders in ``where``
+
+    Returns:
+        Iterator[Dict[str, Any]]: The matching emails, ordered by ID, as
+        dicts with a parsed ``date_received`` and boolean ``is_read``
+    """
+    return map(_row_to_email, _select_emails(where, params))
+
+
+def has_fulltext_index() -> bool:
+    """Return True if the emails_fts trigram index exists (see init_db)."""
+    cursor = Database.get_conn().cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'emails_fts'")
+    return cursor.fetchone() is not None
+
+
+def count_emails() -> int:
+    """Return the number of emails stored in the database."""
+    cursor = Database.get_conn().cursor()
+    cursor.execute("SELECT COUNT(*) FROM emails")
+    return cursor.fetchone()[0]
 
 
 def update_email_folder(message_id: str, folder: str) -> bool:
     """
     Update the folder of an email in the database.
 
+    The change is not committed separately, so it joins any transaction
+    open on the shared connection (see Database.transaction).
+
     Args:
         message_id: The unique message ID of the email
         folder: The new folder name
@@ -78,24 +190,26 @@ def update_email_folder(message_id: str, folder: str) -> bool:
     Returns:
         bool: True if update was successful, False otherwise
     """
-    with Database() as conn:
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE emails SET folder = ? WHERE message_id = ?",
-                (folder, message_id),
-            )
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            print(f"Error updating email folder: {e}")
-            return False
+    conn = Database.get_conn()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE emails SET folder = ? WHERE message_id = ?",
+            (folder, message_id),
+        )
+        return cursor.rowcount > 0
+    except sqlite3.Error as e:
+        logger.error("Error updating email folder: %s", e)
+        return False
 
 
 def update_email_read_status(message_id: str, is_read: bool) -> bool:
     """
     Update the read status of an email in the database.
 
+    The change is not committed separately, so it joins any transaction
+    open on the shared connection (see Database.transaction).
+
     Args:
         message_id: The unique message ID of the email
         is_read: True to mark as read, False to mark as unread
@@ -103,15 +217,48 @@ def update_email_read_status(message_id: str, is_read: bool) -> bool:
     Returns:
         bool: True if update was successful, False otherwise
     """
-    with Database() as conn:
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE emails SET is_read = ? WHERE message_id = ?",
-                (1 if is_read else 0, message_id),
-            )
-            conn.commit()
-            return cursor.rowcount > 0
-        except sqlite3.Error as e:
-            print(f"Error updating email read status: {e}")
-            return False
+    conn = Database.get_conn()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE emails SET is_read = ? WHERE message_id = ?",
+            (1 if is_read else 0, message_id),
+        )
+        return cursor.rowcount > 0
+    except sqlite3.Error as e:
+        logger.error("Error updating email read status: %s", e)
+        return False
+
+
+def update_email_folder_bulk(moves: Iterable[Tuple[str, str]]) -> int:
+    """
+    Update the folders of many emails with one executemany call.
+
+    Like update_email_folder, the changes join any open transaction.
+
+    Args:
+        moves: (folder, message_id) pairs, applied in order
+
+    Returns:
+        int: Number of rows updated
+    """
+    cursor = Database.get_conn().cursor()
+    cursor.executemany("UPDATE emails SET folder = ? WHERE message_id = ?", moves)
+    return cursor.rowcount
+
+
+def update_email_read_status_bulk(reads: Iterable[Tuple[bool, str]]) -> int:
+    """
+    Update the read status of many emails with one executemany call.
+
+    Like update_email_read_status, the changes join any open transaction.
+
+    Args:
+        reads: (is_read, message_id) pairs, applied in order
+
+    Returns:
+        int: Number of rows updated
+    """
+    cursor = Database.get_conn().cursor()
+    cursor.executemany("UPDATE emails SET is_read = ? WHERE message_id = ?", reads)
+    return cursor.rowcount
@@ -1,124 +1,233 @@
 import argparse
-import re
-from datetime import datetime
-from typing import List
+import logging
+import sys
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from tabulate import tabulate
 
 from .constants import DEFAULT_USER
-from .db.database import init_db
+from .db.database import Database, init_db
 from .db.queries import (
-    get_all_emails,
-    insert_email,
+    count_emails,
+    get_email_listing,
+    get_emails_matching,
+    get_existing_message_ids,
+    has_fulltext_index,
+    insert_emails_bulk,
 )
 from .gmail_manager import GmailManager
-from .helpers import email_matches_rule, load_rules, perform_actions
-from .schemas import ActionType, Rule
+from .helpers import (
+    PendingUpdates,
+    compile_rule_to_sql,
+    flush_updates,
+    load_rules,
+    match_rules_batch,
+    perform_actions,
+)
+from .schemas import ActionType, Rule, RuleCondition
+
+logger = logging.getLogger(__name__)
+
+
+def _make_trunc(
+    limit: int, ellipsis: str = "..."
+) -> Callable[[Optional[str]], Optional[str]]:
+    """Return a function cutting text longer than ``limit`` and marking the cut."""
+
+    def trunc(text: Optional[str]) -> Optional[str]:
+        if text and len(text) > limit:
+            return text[:limit] + ellipsis
+        return text
+
+    return trunc
+
+
+_trunc30 = _make_trunc(30)
+_trunc40 = _make_trunc(40)
 
 
 def fetch_and_store_emails(user_email: str = DEFAULT_USER) -> None:
     """Fetch emails from Gmail and store them in the SQLite database."""
-    print("\n📥 Fetching emails from Gmail...\n")
+    logger.info("\n📥 Fetching emails from Gmail...\n")
 
-    # Use GmailManager to fetch emails
-    email_messages = GmailManager.fetch_emails(user_email=user_email)
-
-    if not email_messages:
-        print("ℹ️  No new messages found.")
+    message_ids = GmailManager.list_message_ids(user_email=user_email)
+    if not message_ids:
+        logger.info("ℹ️  No new messages found.")
         return
 
     init_db()
 
+    # Only request details for messages that are not stored yet.
+    existing_ids = get_existing_message_ids(message_ids)
+    if existing_ids:
+        logger.info("ℹ️  Skipping %d email(s) already stored.", len(existing_ids))
+    new_ids = [msg_id for msg_id in message_ids if msg_id not in existing_ids]
+    if not new_ids:
+        return
+
+    email_messages = GmailManager.fetch_details_for(new_ids, user_email)
+
+    # A message with a missing or malformed Date header is skipped so it does
+    # not abort storing the rest of the batch.
+    kept = []
+    rows = []
     for email in email_messages:
-        msg_id = email["message_id"]
-        sender = email["sender"]
-        subject = email["subject"]
-        date = email["date"]
-        snippet = email["snippet"]
+        try:
+            date_received = parsedate_to_datetime(email["date"])
+        except (TypeError, ValueError) as e:
+            logger.error("Error parsing email %s: %s", email["message_id"], e)
+            continue
         folder = email.get("folder", "INBOX")
         is_read = email.get("is_read", False)
+        kept.append(email)
+        rows.append(
+            (
+                email["message_id"],
+                email["sender"],
+                email["subject"],
+                date_received,
+                email["snippet"],
+                folder,
+                1 if is_read else 0,
+            )
+        )
+
+    inserted = insert_emails_bulk(rows)
+
+    # The insert only reports a count, so per-email lines are logged only when
+    # every row was stored; otherwise it is unknown which ones were skipped.
+    if inserted == len(rows):
+        for email, row in zip(kept, rows):
+            logger.info(
+                "✅ Stored new email:\n"
+                "   From: %s\n"
+                "   Subject: %s\n"
+                "   Date: %s\n"
+                "   Folder: %s\n"
+                "   Read: %s\n"
+                "   ----------------------",
+                email["sender"],
+                email["subject"],
+                email["date"],
+                row[5],
+                "Yes" if row[6] else "No",
+            )
+    logger.info(
+        "📥 Stored %d new email(s), skipped %d duplicate(s).",
+        inserted,
+        len(rows) - inserted,
+    )
+
+
+def _rules_to_sql(rules: List[Rule], fulltext: bool = False) -> Tuple[str, List[Any]]:
+    """Build a WHERE clause selecting emails that may match any of the rules."""
+    rule_clauses: List[str] = []
+    params: List[Any] = []
+    for rule in rules:
+        clause, rule_params = compile_rule_to_sql(rule, fulltext)
+        rule_clauses.append(f"({clause})")
+        params.extend(rule_params)
+    return " OR ".join(rule_clauses), params
+
+
+def _describe_condition(condition: RuleCondition) -> str:
+    """Return a one-line, human readable description of a rule condition."""
+    if condition.field == "date_received":
+        return f"   - {condition.field} {condition.predicate} {condition.value} day(s)"
+    return f"   - {condition.field} contains '{condition.contains}'"
 
-        date = re.sub(r"\s*\(UTC\)", "", date)
-        parsed_date = datetime.strptime(date, "%a, %d %b %Y %H:%M:%S %z")
 
-        if insert_email(msg_id, sender, subject, parsed_date, snippet, folder, is_read):
-            print("✅ Stored new email:")
-            print(f"   From: {sender}")
-            print(f"   Subject: {subject}")
-            print(f"   Date: {date}")
-            print(f"   Folder: {folder}")
-            print(f"   Read: {'Yes' if is_read else 'No'}")
-            print("   ----------------------")
-        else:
-            print("ℹ️  Email already exists:")
-            print(f"   Subject: {subject}")
-            print("   ----------------------")
+def _apply_rules(
+    email: Dict[str, Any],
+    matches: Iterable[Tuple[int, Rule]],
+    pending: PendingUpdates,
+) -> bool:
+    """Apply the rules an email matched, given as (1-based position, rule) pairs.
+
+    The resulting updates are queued on ``pending``.
+
+    Returns:
+        bool: True if at least one rule matched
+    """
+    subject = email.get("subject", "No Subject")
+    sender = email.get("sender", "No Sender")
+    date_received = email.get("date_received", "Unknown Date")
+    logger.debug(
+        "📨 Checking email: '%s' from %s received on %s", subject, sender, date_received
+    )
+
+    matched = False
+    for i, rule in matches:
+        matched = True
+        if logger.isEnabledFor(logging.INFO):
+            conditions = "\n".join(map(_describe_condition, rule.conditions))
+            logger.info(
+                "\n✅ Rule %d matched:\n   Subject: %s\n   Rule conditions:\n"
+                "%s\n\n   Performing actions:",
+                i,
+                subject,
+                conditions,
+            )
+        perform_actions(email, rule.actions, pending)
+        logger.info("   ----------------------")
+    return matched
 
 
 def process_emails() -> None:
-    """Load emails from the database, apply rules, and take the defined actions."""
-    emails = get_all_emails()
+    """Load emails from the database, apply rules, and take the defined actions.
+
+    Rules are first pushed down to SQLite so only emails that can match are
+    loaded; the candidates are then checked in one batch with the Python
+    matcher. The resulting updates are written in bulk in a single transaction.
+    """
     rules: List[Rule] = load_rules()
 
     if not rules:
-        print("ℹ️  No rules to process.")
+        logger.info("ℹ️  No rules to process.")
         return
 
-    print("\n📧 Processing emails...\n")
-
-    # Print all rules first
-    print("📋 Current Rules:")
-    for i, rule in enumerate(rules, 1):
-        print(f"\nRule {i}:")
-        print(f"   Predicate: {rule.predicate.upper()}")
-        print("   Conditions:")
-        for condition in rule.conditions:
-            if condition.field == "date_received":
-                print(
-                    f"   - {condition.field} {condition.predicate} "
-                    f"{condition.value} day(s)"
-                )
-            else:
-                print(f"   - {condition.field} contains '{condition.contains}'")
-        print("   Actions:")
-        for action in rule.actions:
-            if action.action == ActionType.MARK_READ:
-                print("   - Mark as read")
-            elif action.action == ActionType.MARK_UNREAD:
-                print("   - Move to unread")
-            elif action.action == ActionType.MOVE:
-                print(f"   - Move to folder: {action.folder}")
-    print("\n" + "=" * 50 + "\n")
+    logger.info("\n📧 Processing emails...\n")
+
+    # Log all rules first
+    if logger.isEnabledFor(logging.INFO):
+        lines = ["📋 Current Rules:"]
+        for i, rule in enumerate(rules, 1):
+            lines.append(f"\nRule {i}:")
+            lines.append(f"   Predicate: {rule.predicate.upper()}")
+            lines.append("   Conditions:")
+            lines.extend(map(_describe_condition, rule.conditions))
+            lines.append("   Actions:")
+            for action in rule.actions:
+                if action.action == ActionType.MARK_READ:
+                    lines.append("   - Mark as read")
+                elif action.action == ActionType.MARK_UNREAD:
+                    lines.append("   - Move to unread")
+                elif action.action == ActionType.MOVE:
+                    lines.append(f"   - Move to folder: {action.folder}")
+        lines.append("\n" + "=" * 50 + "\n")
+        logger.info("\n".join(lines))
+
+    where, params = _rules_to_sql(rules, fulltext=has_fulltext_index())
+    emails = list(get_emails_matching(where, params))
 
+    # One clock reading for the whole run keeps date conditions consistent.
+    masks = match_rules_batch(emails, rules, now=time.time())
+    pending = PendingUpdates()
     rules_matched = False
-    for email in emails:
-        subject = email.get("subject", "No Subject")
-        sender = email.get("sender", "No Sender")
-        date_received = email.get("date_received", "Unknown Date")
-        print(
-            f"📨 Checking email: '{subject}' from {sender} received on {date_received}"
-        )
+    for email, hits in zip(emails, zip(*masks)):
+        matches = [
+            (i, rule) for i, (rule, hit) in enumerate(zip(rules, hits), 1) if hit
+        ]
+        if _apply_rules(email, matches, pending):
+            rules_matched = True
 
-        for i, rule in enumerate(rules, 1):
-            if email_matches_rule(email, rule):
-                rules_matched = True
-                print(f"\n✅ Rule {i} matched:")
-                print(f"   Subject: {subject}")
-                print("   Rule conditions:")
-                for condition in rule.conditions:
-                    if condition.field == "date_received":
-                        print(
-                            f"   - {condition.field} {condition.predicate} "
-                            f"{condition.value} day(s)"
-                        )
-                    else:
-                        print(f"   - {condition.field} contains '{condition.contains}'")
-                print("\n   Performing actions:")
-                perform_actions(email, rule.actions)
-                print("   ----------------------")
+    with Database.transaction():
+        flush_updates(pending)
 
     if not rules_matched:
-        print("\nℹ️  No rules matched with any email")
+        logger.info("\nℹ️  No rules matched with any email")
 
 
 def display_emails(limit: int = 10) -> None:
@@ -127,8 +236,8 @@ def display_emails(limit: int = 10) -> None:
     Args:
         limit: Maximum number of emails to display
     """
-    emails = get_all_emails()
-    if not emails:
+    total = count_emails()
+    if not total:
         print("No emails found in database.")
         return
 
@@ -136,23 +245,24 @@ def display_emails(limit: int = 10) -> None:
     headers = ["ID", "From", "Subject", "Date", "Folder", "Read"]
     table_data = [
         [
-            email["id"],
-            email["sender"][:30] + "..."
-            if email["sender"] and len(email["sender"]) > 30
-            else email["sender"],
-            email["subject"][:40] + "..."
-            if email["subject"] and len(email["subject"]) > 40
-            else email["subject"],
-            email["date_received"],
-            email["folder"],
-            "✓" if email["is_read"] else "✗",
+            email_id,
+            _trunc30(sender),
+            _trunc40(subject),
+            date_received,
+            folder,
+            "✓" if is_read else "✗",
         ]
-        for email in emails[:limit]
+        for email_id, sender, subject, date_received, folder, is_read in (
+            get_email_listing(limit)
+        )
     ]
 
-    print("\n📧 Recent Emails:\n")
-    print(tabulate(table_data, headers=headers, tablefmt="grid"))
-    print(f"\nShowing {min(len(emails), limit)} of {len(emails)} emails")
+    # Render the whole listing up front and write it out in one call.
+    table = tabulate(table_data, headers=headers, tablefmt="grid")
+    sys.stdout.write(
+        f"\n📧 Recent Emails:\n\n{table}\n"
+        f"\nShowing {len(table_data)} of {total} emails\n"
+    )
 
 
 if __name__ == "__main__":
@@ -172,8 +282,19 @@ if __name__ == "__main__":
         default=10,
         help="Number of emails to display (default: 10)",
     )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Also log every email checked while processing",
+    )
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(message)s",
+        stream=sys.stdout,
+    )
+
     if args.mode == "fetch":
         user_email: str = input("Enter your email address for Gmail OAuth: ").strip()
         if not user_email:
@@ -1,3 +1,4 @@
+import logging
 import os
 import pickle
 from typing import Any, Dict, List, Optional
@@ -6,7 +7,15 @@ from google.auth.transport.requests import Request  # type: ignore
 from google_auth_oauthlib.flow import InstalledAppFlow  # type: ignore
 from googleapiclient.discovery import build  # type: ignore
 
-from .constants import CREDENTIALS_PATH, GMAIL_SCOPES, TOKEN_PATH
+from .constants import (
+    CREDENTIALS_PATH,
+    GMAIL_BATCH_SIZE,
+    GMAIL_METADATA_HEADERS,
+    GMAIL_SCOPES,
+    TOKEN_PATH,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class GmailManager:
@@ -32,7 +41,8 @@ class GmailManager:
         4. Saves token for future use
 
         Returns:
-            An authenticated Gmail API service instance
+            An authenticated Gmail API service instance that reuses a single
+            keep-alive HTTP connection
 
         Note:
             Requires credentials.json file from Google Cloud Console
@@ -90,6 +100,25 @@ class GmailManager:
                 'snippet': str,
             }
         """
+        message_ids = cls.list_message_ids(user_email, max_results)
+        if not message_ids:
+            return []
+
+        return cls.fetch_details_for(message_ids, user_email)
+
+    @classmethod
+    def list_message_ids(
+        cls, user_email: str = "me", max_results: int = 10
+    ) -> List[str]:
+        """List the IDs of the most recent messages in the inbox.
+
+        Args:
+            user_email: Gmail user email address or 'me' for authenticated user
+            max_results: Maximum number of message IDs to return
+
+        Returns:
+            List of Gmail message IDs, newest first
+        """
         service = cls.get_service()
         results = (
             service.users()
@@ -97,34 +126,69 @@ class GmailManager:
             .list(userId=user_email, labelIds=["INBOX"], maxResults=max_results)
             .execute()
         )
+        return [message["id"] for message in results.get("messages", [])]
 
-        messages = results.get("messages", [])
-        if not messages:
-            return []
+    @classmethod
+    def fetch_details_for(
+        cls, message_ids: List[str], user_email: str = "me"
+    ) -> List[Dict[str, Any]]:
+        """Fetch header details for the given messages.
 
-        email_messages = []
-        for message in messages:
-            msg = cls._get_email_details(message["id"], user_email)
-            if msg:
-                email_messages.append(msg)
+        Requests are sent through Gmail's batch endpoint, GMAIL_BATCH_SIZE
+        messages per HTTP round-trip, and only the metadata headers that are
+        stored are requested.
 
-        return email_messages
+        Args:
+            message_ids: Gmail message IDs to fetch
+            user_email: Gmail user email address
 
-    @classmethod
-    def _get_email_details(
-        cls, message_id: str, user_email: str = "me"
-    ) -> Optional[Dict[str, Any]]:
-        """Get detailed information for a specific email.
+        Returns:
+            List of email detail dictionaries (see _parse_message), in the
+            order of ``message_ids``; messages that fail to load are skipped
+        """
+        service = cls.get_service()
+        details: Dict[str, Dict[str, Any]] = {}
+
+        def _handle(request_id: str, response: Any, exception: Any) -> None:
+            if exception is not None:
+                logger.error("Error fetching email %s: %s", request_id, exception)
+                return
+            # Batch callbacks run inside batch.execute(), so a malformed message
+            # must not raise and discard the rest of the batch.
+            try:
+                details[request_id] = cls._parse_message(response)
+            except Exception as e:
+                logger.error("Error fetching email %s: %s", request_id, e)
+
+        for start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_handle)
+            for message_id in message_ids[start : start + GMAIL_BATCH_SIZE]:
+                batch.add(
+                    service.users()
+                    .messages()
+                    .get(
+                        userId=user_email,
+                        id=message_id,
+                        format="metadata",
+                        metadataHeaders=GMAIL_METADATA_HEADERS,
+                    ),
+                    request_id=message_id,
+                )
+            batch.execute()
 
-        Fetches and processes the full email content, including headers
-        and message body.
+        return [
+            details[message_id] for message_id in message_ids if message_id in details
+        ]
+
+    @staticmethod
+    def _parse_message(msg: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract the stored fields from a Gmail message resource.
 
         Args:
-            message_id: Gmail message ID
-            user_email: Gmail user email address
+            msg: Message resource returned by ``users.messages.get``
 
         Returns:
-            Dictionary containing email details or None if retrieval fails:
+            Dictionary containing email details:
             {
                 'message_id': str,
                 'sender': str,
@@ -132,36 +196,15 @@ class GmailManager:
                 'date': str,
                 'snippet': str,
             }
-
         """
-        try:
-            service = cls.get_service()
-            msg = (
-                service.users()
-                .messages()
-                .get(userId=user_email, id=message_id, format="full")
-                .execute()
-            )
-
-            headers = msg["payload"].get("headers", [])
-            email_data = {
-                "message_id": message_id,
-                "sender": None,
-                "subject": None,
-                "date": None,
-                "snippet": msg.get("snippet"),
-            }
-
-            for header in headers:
-                header_name = header["name"].lower()
-                if header_name == "subject":
-                    email_data["subject"] = header["value"]
-                elif header_name == "from":
-                    email_data["sender"] = header["value"]
-                elif header_name == "date":
-                    email_data["date"] = header["value"]
-
-            return email_data
-        except Exception as e:
-            print(f"Error fetching email {message_id}: {e}")
-            return None
+        headers = {
+            header["name"].lower(): header["value"]
+            for header in msg["payload"].get("headers", [])
+        }
+        return {
+            "message_id": msg["id"],
+            "sender": headers.get("from"),
+            "subject": headers.get("subject"),
+            "date": headers.get("date"),
+            "snippet": msg.get("snippet"),
+        }
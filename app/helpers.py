@@ -1,49 +1,290 @@
-import json
+import logging
 import os
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
+
+from pydantic import TypeAdapter
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is an optional speedup
+    from json import loads as _json_loads
 
-from .constants import DEFAULT_RULES_PATH
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # pyahocorasick is an optional speedup
+    ahocorasick = None
+
+from .constants import ASCII_FOLD_GLOB, DEFAULT_RULES_PATH
 from .db.queries import (
     update_email_folder,
+    update_email_folder_bulk,
     update_email_read_status,
+    update_email_read_status_bulk,
 )
 from .schemas import ActionType, PredicateType, Rule, RuleAction, RuleCondition, Rules
 
+logger = logging.getLogger(__name__)
+
+# Text columns that rule conditions can filter with LIKE in SQL.
+_TEXT_COLUMNS = frozenset({"message_id", "sender", "subject", "snippet", "folder"})
+
+# Text columns covered by the emails_fts trigram index.
+_FULLTEXT_COLUMNS = frozenset({"sender", "subject", "snippet"})
+
+# SQLite reads naive timestamps as UTC while the Python matcher reads them as
+# local time, so SQL date bounds are widened by a day to never drop a match.
+_DATE_SLACK_DAYS = 1
+
+# ASCII letters that str.lower() also produces from a non-ASCII character (see
+# ASCII_FOLD_GLOB): LIKE cannot fold those, so needles containing one of these
+# letters also accept values matching ASCII_FOLD_GLOB.
+_ASCII_FOLD_LETTERS = frozenset("ik")
+
+# Validates a whole rule list in one pydantic-core call.
+_RULES_ADAPTER: TypeAdapter[List[Rule]] = TypeAdapter(List[Rule])
+
+# Validated rules per rules file, keyed on the file's (mtime_ns, size) at load.
+_RULES_CACHE: Dict[str, Tuple[Tuple[int, int], List[Rule]]] = {}
+
+_SECONDS_PER_DAY = 86400
+
+# Relative cost of checking a condition on each field: short fixed values and
+# a single float comparison before substring scans of longer free text.
+_CONDITION_COSTS = {
+    "folder": 0,
+    "is_read": 0,
+    "date_received": 1,
+    "sender": 2,
+    "subject": 3,
+}
+
+# Predicates supported by date_received conditions.
+_DATE_PREDICATES = frozenset({"is_less_than", "is_greater_than"})
+
 
 def load_rules(rules_file: str = DEFAULT_RULES_PATH) -> List[Rule]:
-    """Load processing rules from the JSON file."""
-    if not os.path.exists(rules_file):
-        print(f"No rules file found: {rules_file}")
+    """Load processing rules from the JSON file.
+
+    Parsed rules are cached and reused until the file is modified.
+    """
+    try:
+        stat = os.stat(rules_file)
+    except FileNotFoundError:
+        logger.warning("No rules file found: %s", rules_file)
         return []
-    with open(rules_file) as f:
-        rules_dict = json.load(f)
-    return Rules.model_validate(rules_dict).rules
 
+    path = os.path.abspath(rules_file)
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _RULES_CACHE.get(path)
+    if cached is not None and cached[0] == version:
+        return list(cached[1])
+
+    rules_dict = _json_loads(Path(rules_file).read_bytes())
+    if isinstance(rules_dict, dict) and "rules" in rules_dict:
+        rules = _RULES_ADAPTER.validate_python(rules_dict["rules"])
+    else:
+        # Report a malformed file through the file schema's ValidationError.
+        rules = Rules.model_validate(rules_dict).rules
+    _RULES_CACHE[path] = (version, rules)
+    return list(rules)
+
+
+def _condition_cost(condition: RuleCondition) -> Tuple[int, int]:
+    """Estimate how expensive a condition is to check, for ordering checks."""
+    return _CONDITION_COSTS.get(condition.field, 9), len(condition._needle)
+
+
+def _lowered_values(
+    emails: Sequence[Dict[str, Any]],
+    field: str,
+    rows: Iterable[int],
+    lowered: Dict[str, Dict[int, str]],
+) -> List[str]:
+    """Return a field's lowercased values for the given rows.
+
+    Each value is lowercased at most once per batch.
+    """
+    column = lowered.setdefault(field, {})
+    values = []
+    for row in rows:
+        value = column.get(row)
+        if value is None:
+            value = column[row] = (emails[row].get(field) or "").lower()
+        values.append(value)
+    return values
+
+
+def _scan_needles(
+    emails: Sequence[Dict[str, Any]],
+    rules: List[Rule],
+    lowered: Dict[str, Dict[int, str]],
+) -> Dict[Tuple[Any, ...], List[Optional[bool]]]:
+    """Find all substring needles of a rule set with one scan per field.
+
+    Each field searched by several conditions gets one Aho-Corasick automaton
+    over all of its needles, so each value is scanned once rather than once
+    per needle.
+
+    Returns:
+        Condition results for every email, keyed on (field, needle)
+    """
+    needles: Dict[str, Set[str]] = {}
+    for rule in rules:
+        for condition in rule.conditions:
+            if condition.field != "date_received" and condition._needle:
+                needles.setdefault(condition.field, set()).add(condition._needle)
+
+    results: Dict[Tuple[Any, ...], List[Optional[bool]]] = {}
+    for field, field_needles in needles.items():
+        if len(field_needles) < 2:
+            continue
+        automaton = ahocorasick.Automaton()
+        for needle in field_needles:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+        found = [
+            {needle for _, needle in automaton.iter(value)}
+            for value in _lowered_values(emails, field, range(len(emails)), lowered)
+        ]
+        for needle in field_needles:
+            results[field, needle] = [needle in hits for hits in found]
+    return results
+
+
+def _condition_key(condition: RuleCondition) -> Tuple[Any, ...]:
+    """Identify a condition, so identical conditions share their results."""
+    if condition.field == "date_received":
+        return condition.field, condition._needle, condition.predicate
+    return condition.field, condition._needle
+
+
+def _can_match(condition: RuleCondition) -> bool:
+    """Return False for conditions no email can satisfy."""
+    if condition.field == "date_received" and condition._needle:
+        return condition.predicate in _DATE_PREDICATES
+    return bool(condition._needle)
+
+
+def _condition_results(
+    condition: RuleCondition,
+    emails: Sequence[Dict[str, Any]],
+    rows: List[int],
+    lowered: Dict[str, Dict[int, str]],
+    now: float,
+) -> List[bool]:
+    """Evaluate a condition that can match for the emails at ``rows``."""
+    field = condition.field
+
+    if field == "date_received":
+        # Date conditions carry their day count in ``value``.
+        cutoff = now - int(cast(str, condition.value)) * _SECONDS_PER_DAY
+        stamps = [emails[row].get(field, "").timestamp() for row in rows]
+        if condition.predicate == "is_less_than":
+            return [stamp < cutoff for stamp in stamps]
+        return [stamp > cutoff for stamp in stamps]
+
+    needle = condition._needle
+    return [needle in value for value in _lowered_values(emails, field, rows, lowered)]
 
-def parse_date_condition(email_date: datetime, condition: RuleCondition) -> bool:
-    """Check if an email's received date satisfies the condition."""
-    if email_date.tzinfo is None:
-        email_date = email_date.astimezone()
 
-    now = datetime.now().astimezone()
-    compare_date = now - timedelta(days=int(condition.value))
+def match_rules_batch(
+    emails: Sequence[Dict[str, Any]], rules: List[Rule], now: Optional[float] = None
+) -> List[List[bool]]:
+    """
+    Match a batch of emails against every rule, one condition at a time.
+
+    Each rule checks its conditions cheapest first (see _CONDITION_COSTS),
+    and each condition only on the emails still undecided: those passing
+    every earlier condition of an "all" rule, or no earlier condition of an
+    "any" rule. A condition's result for an email is computed once per
+    batch and shared by every rule using the same condition. When
+    pyahocorasick is installed, fields searched for several substrings are
+    scanned once for all of them.
+
+    Args:
+        emails: The emails to check
+        rules: Rules to check, in order
+        now: Timestamp date conditions are measured from
+
+    Returns:
+        List[List[bool]]: One mask per rule, flagging the emails it matches
+    """
+    if now is None:
+        now = time.time()
+    size = len(emails)
+    lowered: Dict[str, Dict[int, str]] = {}
+    known: Dict[Tuple[Any, ...], List[Optional[bool]]] = {}
+    if ahocorasick is not None:
+        known.update(_scan_needles(emails, rules, lowered))
+    masks: List[List[bool]] = []
+
+    for rule in rules:
+        is_all = rule.predicate == PredicateType.ALL.value
+        conditions = sorted(rule.conditions, key=_condition_cost)
+        if is_all and not all(map(_can_match, conditions)):
+            masks.append([False] * size)
+            continue
+
+        mask = [False] * size
+        # Emails the rule has not decided yet: still passing for "all" rules,
+        # not yet matched for "any" rules.
+        rows = list(range(size))
+        for condition in conditions:
+            if not rows:
+                break
+            if not _can_match(condition):
+                continue
+
+            results = known.get(_condition_key(condition))
+            if results is None:
+                results = known[_condition_key(condition)] = [None] * size
+            pending = [row for row in rows if results[row] is None]
+            if pending:
+                values = _condition_results(condition, emails, pending, lowered, now)
+                for row, value in zip(pending, values):
+                    results[row] = value
+
+            if is_all:
+                rows = [row for row in rows if results[row]]
+            else:
+                for row in rows:
+                    if results[row]:
+                        mask[row] = True
+                rows = [row for row in rows if not results[row]]
 
-    if condition.predicate == "is_less_than":
-        return email_date < compare_date
-    elif condition.predicate == "is_greater_than":
-        return email_date > compare_date
+        if is_all:
+            for row in rows:
+                mask[row] = True
+        masks.append(mask)
 
-    return False
+    return masks
 
 
-def email_matches_rule(email: Dict[str, Any], rule: Rule) -> bool:
+def email_matches_rule(
+    email: Dict[str, Any], rule: Rule, now: Optional[float] = None
+) -> bool:
     """
     Determine if an email matches a rule.
 
+    Date conditions are measured from the ``now`` timestamp, which defaults
+    to the current time.
+
     Rule format example:
       {
-        "predicate": "and",
+        "predicate": "all",
         "conditions": [
             {"field": "subject", "contains": "urgent"},
             {"field": "sender", "contains": "boss@example.com"}
@@ -51,39 +292,173 @@ def email_matches_rule(email: Dict[str, Any], rule: Rule) -> bool:
         "actions": [ ... ]
       }
     """
-    predicate: str = rule.predicate
-    conditions: List[RuleCondition] = rule.conditions
+    return match_rules_batch([email], [rule], now)[0][0]
+
 
-    results: List[bool] = []
-    for condition in conditions:
-        field: str = condition.field
-        value: Optional[str] = condition.value or condition.contains
-        email_value = email.get(field, "")
+def match_rules(
+    email: Dict[str, Any], rules: List[Rule], now: Optional[float] = None
+) -> Iterator[Tuple[int, Rule]]:
+    """
+    Yield the rules an email matches, in order.
 
-        if field == "date_received" and value:
-            results.append(parse_date_condition(email_value, condition))
-        elif email_value and value and value.lower() in email_value.lower():
-            results.append(True)
-        else:
-            results.append(False)
+    The email is matched as a batch of one, so a condition used by several
+    rules is evaluated once.
 
-    return all(results) if predicate == PredicateType.ALL.value else any(results)
+    Args:
+        email: The email to check
+        rules: Rules to check, in order
+        now: Timestamp date conditions are measured from
+
+    Yields:
+        Tuple[int, Rule]: The 1-based position of each matching rule and the rule
+    """
+    masks = match_rules_batch([email], rules, now)
+    for position, (rule, mask) in enumerate(zip(rules, masks), 1):
+        if mask[0]:
+            yield position, rule
 
 
-def perform_actions(email: dict, actions: List[RuleAction]) -> None:
-    """Perform the specified actions on an email."""
+def _condition_to_sql(
+    condition: RuleCondition, fulltext: bool = False
+) -> Tuple[str, List[Any]]:
+    """Translate a rule condition into a parameterized SQL filter.
+
+    The filter may accept more emails than the condition does (``"1"`` is
+    used for anything SQL cannot express exactly) but never fewer, so the
+    Python matcher still has the final say. With ``fulltext`` set, substring
+    conditions on indexed columns are answered by the emails_fts index.
+
+    LIKE and the trigram index only fold ASCII case, while the matcher
+    lowercases with str.lower(), which also maps a few non-ASCII characters
+    to ASCII letters (see ASCII_FOLD_GLOB). Values containing one of those
+    characters are always accepted by needles using such a letter, through the
+    partial indexes for the indexed columns.
+    """
+    needle = condition._needle
+    if condition.field == "date_received" and needle:
+        # A missing or non-numeric day count is left to the Python matcher.
+        try:
+            days = int(condition.value or "")
+        except ValueError:
+            return "1", []
+        if condition.predicate == "is_less_than":
+            return "julianday(date_received) < julianday('now') - ?", [
+                days - _DATE_SLACK_DAYS
+            ]
+        if condition.predicate == "is_greater_than":
+            return "julianday(date_received) > julianday('now') - ?", [
+                days + _DATE_SLACK_DAYS
+            ]
+        return "0", []
+
+    if condition.field not in _TEXT_COLUMNS:
+        return "1", []
+    if not needle:
+        return "0", []
+    if not needle.isascii():
+        # SQLite's LIKE only folds ASCII case.
+        return "1", []
+    if not any(c in "%_\\" for c in needle):
+        # FTS5 can only use its trigram index for LIKE without ESCAPE.
+        like = f"{condition.field} LIKE ?"
+        pattern = f"%{needle}%"
+    else:
+        escaped = needle.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        like = f"{condition.field} LIKE ? ESCAPE '\\'"
+        pattern = f"%{escaped}%"
+    params: List[Any] = [pattern]
+    if fulltext and condition.field in _FULLTEXT_COLUMNS:
+        like = f"id IN (SELECT rowid FROM emails_fts WHERE {like})"
+    if not _ASCII_FOLD_LETTERS.isdisjoint(needle):
+        # A literal, not a parameter, so it matches the partial index WHERE.
+        folds = f"{condition.field} GLOB '{ASCII_FOLD_GLOB}'"
+        if condition.field in _FULLTEXT_COLUMNS:
+            folds = f"id IN (SELECT id FROM emails WHERE {folds})"
+        like = f"{like} OR {folds}"
+    return like, params
+
+
+def compile_rule_to_sql(rule: Rule, fulltext: bool = False) -> Tuple[str, List[Any]]:
+    """
+    Translate a rule into a parameterized SQL filter for the emails table.
+
+    Date comparisons and substring conditions are pushed down to SQLite, so
+    emails that cannot match are never loaded. Anything SQL cannot express
+    exactly is left to the Python matcher, which checks every email the
+    filter returns.
+
+    Args:
+        rule: The rule to translate
+        fulltext: Answer substring conditions with the emails_fts index
+
+    Returns:
+        Tuple[str, List[Any]]: The WHERE clause and its parameters
+    """
+    is_all = rule.predicate == PredicateType.ALL.value
+    clauses: List[str] = []
+    params: List[Any] = []
+    for condition in rule.conditions:
+        clause, clause_params = _condition_to_sql(condition, fulltext)
+        clauses.append(f"({clause})")
+        params.extend(clause_params)
+    if not clauses:
+        return ("1" if is_all else "0"), params
+    return (" AND " if is_all else " OR ").join(clauses), params
+
+
+class PendingUpdates:
+    """Email updates collected by perform_actions for flush_updates to write.
+
+    Attributes:
+        reads: (is_read, message_id) pairs, in the order they were requested
+        moves: (folder, message_id) pairs, in the order they were requested
+    """
+
+    def __init__(self) -> None:
+        self.reads: List[Tuple[bool, str]] = []
+        self.moves: List[Tuple[str, str]] = []
+
+
+def flush_updates(pending: PendingUpdates) -> None:
+    """Write the collected updates with one executemany per column, then clear."""
+    if pending.reads:
+        update_email_read_status_bulk(pending.reads)
+    if pending.moves:
+        update_email_folder_bulk(pending.moves)
+    pending.reads.clear()
+    pending.moves.clear()
+
+
+def perform_actions(
+    email: dict, actions: List[RuleAction], pending: Optional[PendingUpdates] = None
+) -> None:
+    """Perform the specified actions on an email.
+
+    Updates are written immediately, or queued on ``pending`` to be written
+    in bulk by flush_updates.
+    """
+    message_id = email["message_id"]
     for action in actions:
         if action.action == ActionType.MOVE:
             if not action.folder:
-                print("No folder specified for move action")
+                logger.warning("No folder specified for move action")
                 continue
-            print(f"Moving email {email['message_id']} to folder '{action.folder}'")
-            update_email_folder(email["message_id"], action.folder)
+            logger.info("Moving email %s to folder '%s'", message_id, action.folder)
+            if pending is None:
+                update_email_folder(message_id, action.folder)
+            else:
+                pending.moves.append((action.folder, message_id))
 
         elif action.action == ActionType.MARK_READ:
-            print(f"Marking email {email['message_id']} as read")
-            update_email_read_status(email["message_id"], True)
+            logger.info("Marking email %s as read", message_id)
+            if pending is None:
+                update_email_read_status(message_id, True)
+            else:
+                pending.reads.append((True, message_id))
 
         elif action.action == ActionType.MARK_UNREAD:
-            print(f"Marking email {email['message_id']} as unread")
-            update_email_read_status(email["message_id"], False)
+            logger.info("Marking email %s as unread", message_id)
+            if pending is None:
+                update_email_read_status(message_id, False)
+            else:
+                pending.reads.append((False, message_id))
@@ -1,7 +1,7 @@
 from enum import StrEnum
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 class EmailModel(BaseModel):
@@ -19,13 +19,22 @@ class EmailModel(BaseModel):
 
 
 class RuleCondition(BaseModel):
-    """Pydantic Model for a single rule condition."""
+    """Pydantic Model for a single rule condition.
+
+    The lowercased match value is computed once after validation so rule
+    matching does not re-lowercase it for every email.
+    """
 
     field: str
     contains: Optional[str] = None
     value: Optional[str] = None
     predicate: Optional[str] = None
 
+    _needle: str = PrivateAttr(default="")
+
+    def model_post_init(self, __context: Any) -> None:
+        self._needle = (self.value or self.contains or "").lower()
+
 
 class ActionType(StrEnum):
     """Enum for supported email actions.
@@ -74,6 +83,6 @@ class Rule(BaseModel):
 
 
 class Rules(BaseModel):
-    """Pydantic Model for multiple rules."""
+    """Pydantic Model for multiple rules, the shape of the rules file."""
 
     rules: List[Rule]
@@ -1,21 +1,93 @@
 """Mock data for testing."""
 
 from datetime import datetime
-from typing import Any, Dict
-
-from ..schemas import ActionType
-
-# Test email data
-SAMPLE_EMAIL: Dict[str, Any] = {
-    "id": 1,
-    "message_id": "test123",
-    "sender": "boss@example.com",
-    "subject": "URGENT: Meeting Now",
-    "date_received": datetime.now(),
-    "snippet": "Please join the meeting",
-    "folder": "Inbox",
-    "is_read": False,
-}
+from typing import Any, Callable, Dict, List, Tuple
+
+from ..schemas import ActionType, Rule
+
+
+def sample_email(**overrides: Any) -> Dict[str, Any]:
+    """Build a new test email received now, with ``overrides`` applied.
+
+    Each call returns a fresh dict, so tests can modify it freely.
+    """
+    email: Dict[str, Any] = {
+        "id": 1,
+        "message_id": "test123",
+        "sender": "boss@example.com",
+        "subject": "URGENT: Meeting Now",
+        "date_received": datetime.now(),
+        "snippet": "Please join the meeting",
+        "folder": "Inbox",
+        "is_read": False,
+    }
+    email.update(overrides)
+    return email
+
+
+def gmail_message(message_id: str, subject: str = "Hello") -> Dict[str, Any]:
+    """Build a Gmail ``users.messages.get`` metadata resource."""
+    return {
+        "id": message_id,
+        "snippet": "Hi",
+        "payload": {
+            "headers": [
+                {"name": "From", "value": "a@test.com"},
+                {"name": "Subject", "value": subject},
+                {"name": "Date", "value": "Mon, 01 Jan 2024 10:00:00 +0000"},
+            ]
+        },
+    }
+
+
+class FakeGmailBatch:
+    """Stand-in for a Gmail batch request, answered from a FakeGmailService."""
+
+    def __init__(self, service: "FakeGmailService", callback: Callable) -> None:
+        self.service = service
+        self.callback = callback
+        self.requests: List[Dict[str, Any]] = []
+
+    def add(self, request: Dict[str, Any], request_id: str) -> None:
+        self.requests.append(request)
+
+    def execute(self) -> None:
+        self.service.batches.append([request["id"] for request in self.requests])
+        for request in self.requests:
+            response = self.service.responses[request["id"]]
+            if isinstance(response, Exception):
+                self.callback(request["id"], None, response)
+            else:
+                self.callback(request["id"], response, None)
+
+
+class FakeGmailService:
+    """Stand-in for the Gmail API service answering batched message gets.
+
+    ``responses`` maps message IDs to the resource returned for them, or to an
+    exception the request fails with. The IDs of each executed batch are
+    recorded in ``batches``.
+    """
+
+    def __init__(self, responses: Dict[str, Any]) -> None:
+        self.responses = responses
+        self.batches: List[List[str]] = []
+
+    def users(self) -> "FakeGmailService":
+        return self
+
+    def messages(self) -> "FakeGmailService":
+        return self
+
+    def get(self, **kwargs: Any) -> Dict[str, Any]:
+        return kwargs
+
+    def new_batch_http_request(self, callback: Callable) -> FakeGmailBatch:
+        return FakeGmailBatch(self, callback)
+
+
+# Test email data, built once at import; use sample_email() for a fresh copy.
+SAMPLE_EMAIL: Dict[str, Any] = sample_email()
 
 # Test rules data
 SAMPLE_RULES_JSON = {
@@ -64,3 +136,8 @@ SAMPLE_RULES_JSON = {
         },
     ]
 }
+
+# SAMPLE_RULES_JSON validated once at import, for tests that need Rule objects.
+SAMPLE_RULES: Tuple[Rule, ...] = tuple(
+    Rule.model_validate(rule) for rule in SAMPLE_RULES_JSON["rules"]
+)
@@ -1,15 +1,31 @@
 import json
+import logging
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from pydantic import ValidationError
 
+from app.constants import GMAIL_BATCH_SIZE
 from app.db.database import Database, init_db
-from app.email_processor import display_emails
+from app.db.queries import insert_email, insert_emails_bulk
+from app.email_processor import (
+    display_emails,
+    fetch_and_store_emails,
+    process_emails,
+)
+from app.gmail_manager import GmailManager
 from app.helpers import (
+    PendingUpdates,
+    _condition_results,
+    compile_rule_to_sql,
     email_matches_rule,
+    flush_updates,
     load_rules,
+    match_rules,
+    match_rules_batch,
     perform_actions,
 )
 from app.schemas import (
@@ -19,18 +35,34 @@ from app.schemas import (
     RuleAction,
 )
 
-from .mocks import SAMPLE_EMAIL, SAMPLE_RULES_JSON
+from .mocks import (
+    SAMPLE_EMAIL,
+    SAMPLE_RULES,
+    SAMPLE_RULES_JSON,
+    FakeGmailService,
+    gmail_message,
+    sample_email,
+)
+
+
+@pytest.fixture(scope="module")
+def database_connection():
+    """Create one in-memory test database shared by the tests in this module."""
+    conn = init_db(":memory:")
+    yield conn
+    conn.close()
 
 
 class TestEmailProcessor:
     # Fixtures
     @pytest.fixture(autouse=True)
-    def setup(self, tmp_path):
-        """Setup test database for each test."""
-        self.test_database_path = str(tmp_path / "test.db")
-        self.database_connection = init_db(self.test_database_path)
+    def setup(self, database_connection):
+        """Run each test in a savepoint that is rolled back afterwards."""
+        self.database_connection = database_connection
+        database_connection.execute("SAVEPOINT test")
         yield
-        self.database_connection.close()
+        database_connection.execute("ROLLBACK TO test")
+        database_connection.execute("RELEASE test")
 
     @pytest.fixture
     def sample_emails(self):
@@ -73,7 +105,6 @@ class TestEmailProcessor:
             """,
             emails,
         )
-        self.database_connection.commit()
         return emails
 
     @pytest.fixture
@@ -103,6 +134,174 @@ class TestEmailProcessor:
         )
         assert cursor.fetchone() is not None
 
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        indexes = {row[0] for row in cursor}
+        assert {
+            "idx_emails_date_received",
+            "idx_emails_sender_ascii_folds",
+            "idx_emails_subject_ascii_folds",
+            "idx_emails_snippet_ascii_folds",
+        } <= indexes
+
+    def test_transaction_rolls_back_on_error(self, sample_emails):
+        """Test a failing transaction block leaves the database unchanged."""
+        with patch.object(Database, "get_conn", return_value=self.database_connection):
+            with pytest.raises(RuntimeError):
+                with Database.transaction() as conn:
+                    conn.execute("DELETE FROM emails")
+                    raise RuntimeError("boom")
+
+        cursor = self.database_connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM emails")
+        assert cursor.fetchone()[0] == len(sample_emails)
+
+    def test_fulltext_index_tracks_emails(self, sample_emails):
+        """Test the emails_fts index follows inserts, updates and deletes."""
+        cursor = self.database_connection.cursor()
+        query = "SELECT rowid FROM emails_fts WHERE subject LIKE ? ORDER BY rowid"
+
+        cursor.execute(query, ("%subject%",))
+        assert cursor.fetchall() == [(1,), (2,), (3,)]
+
+        cursor.execute("UPDATE emails SET subject = 'Renamed' WHERE id = 2")
+        cursor.execute("DELETE FROM emails WHERE id = 3")
+        cursor.execute(query, ("%subject%",))
+        assert cursor.fetchall() == [(1,)]
+        cursor.execute(query, ("%renamed%",))
+        assert cursor.fetchall() == [(2,)]
+
+    def test_fetch_and_store_emails_reports_duplicates(self, caplog):
+        """Test stored and skipped counts come from the actual insert."""
+        caplog.set_level(logging.INFO)
+        message = {
+            "message_id": "new1",
+            "sender": "a@test.com",
+            "subject": "Hello",
+            "date": "Mon, 01 Jan 2024 10:00:00 +0000",
+            "snippet": "Hi",
+        }
+        with (
+            patch.object(Database, "get_conn", return_value=self.database_connection),
+            patch("app.email_processor.init_db"),
+            patch.object(GmailManager, "list_message_ids", return_value=["new1"]),
+            patch.object(
+                GmailManager, "fetch_details_for", return_value=[message, message]
+            ),
+        ):
+            fetch_and_store_emails()
+
+        assert "Stored 1 new email(s), skipped 1 duplicate(s)." in caplog.text
+        assert "Stored new email:" not in caplog.text
+        cursor = self.database_connection.cursor()
+        cursor.execute("SELECT message_id FROM emails")
+        assert cursor.fetchall() == [("new1",)]
+
+    def test_fetch_and_store_emails_skips_unparsable_dates(self, caplog):
+        """Test a message without a usable date does not stop the others."""
+        caplog.set_level(logging.INFO)
+        message = {
+            "message_id": "new1",
+            "sender": "a@test.com",
+            "subject": "Hello",
+            "date": "Mon, 01 Jan 2024 10:00:00 +0000",
+            "snippet": "Hi",
+        }
+        undated = {**message, "message_id": "new2", "subject": "Undated", "date": None}
+        with (
+            patch.object(Database, "get_conn", return_value=self.database_connection),
+            patch("app.email_processor.init_db"),
+            patch.object(
+                GmailManager, "list_message_ids", return_value=["new1", "new2"]
+            ),
+            patch.object(
+                GmailManager, "fetch_details_for", return_value=[undated, message]
+            ),
+        ):
+            fetch_and_store_emails()
+
+        assert "Error parsing email new2" in caplog.text
+        assert "Stored 1 new email(s), skipped 0 duplicate(s)." in caplog.text
+        assert "Subject: Hello" in caplog.text
+        assert "Subject: Undated" not in caplog.text
+        cursor = self.database_connection.cursor()
+        cursor.execute("SELECT message_id FROM emails")
+        assert cursor.fetchall() == [("new1",)]
+
+    def test_fetch_details_for_keeps_order_and_skips_failures(self, caplog):
+        """Test details come back in request order without failed messages."""
+        service = FakeGmailService(
+            {
+                "m3": gmail_message("m3"),
+                "m1": gmail_message("m1"),
+                "gone": Exception("404 Not Found"),
+                "bad": {"id": "bad"},
+                "m2": gmail_message("m2"),
+            }
+        )
+        with patch.object(GmailManager, "get_service", return_value=service):
+            details = GmailManager.fetch_details_for(["m3", "m1", "gone", "bad", "m2"])
+
+        assert [email["message_id"] for email in details] == ["m3", "m1", "m2"]
+        assert details[0] == {
+            "message_id": "m3",
+            "sender": "a@test.com",
+            "subject": "Hello",
+            "date": "Mon, 01 Jan 2024 10:00:00 +0000",
+            "snippet": "Hi",
+        }
+        assert "Error fetching email gone: 404 Not Found" in caplog.text
+        assert "Error fetching email bad" in caplog.text
+
+    def test_fetch_details_for_splits_batches(self):
+        """Test message gets are sent GMAIL_BATCH_SIZE per batch request."""
+        message_ids = [f"m{i}" for i in range(2 * GMAIL_BATCH_SIZE + 1)]
+        service = FakeGmailService({m: gmail_message(m) for m in message_ids})
+        with patch.object(GmailManager, "get_service", return_value=service):
+            details = GmailManager.fetch_details_for(message_ids)
+
+        assert [len(batch) for batch in service.batches] == [
+            GMAIL_BATCH_SIZE,
+            GMAIL_BATCH_SIZE,
+            1,
+        ]
+        assert sum(service.batches, []) == message_ids
+        assert [email["message_id"] for email in details] == message_ids
+
+    def test_fetch_and_store_emails_fetches_only_new_ids(self, sample_emails):
+        """Test details are requested only for messages not stored yet."""
+        service = FakeGmailService({"new1": gmail_message("new1")})
+        with (
+            patch.object(Database, "get_conn", return_value=self.database_connection),
+            patch("app.email_processor.init_db"),
+            patch.object(
+                GmailManager, "list_message_ids", return_value=["msg1", "new1"]
+            ),
+            patch.object(GmailManager, "get_service", return_value=service),
+        ):
+            fetch_and_store_emails()
+
+        assert service.batches == [["new1"]]
+        cursor = self.database_connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM emails WHERE message_id = 'new1'")
+        assert cursor.fetchone()[0] == 1
+
+    def test_insert_email_duplicate(self, sample_emails):
+        """Test inserting an already stored message ID reports a duplicate."""
+        with patch.object(Database, "get_conn", return_value=self.database_connection):
+            assert insert_email(*sample_emails[0]) is False
+            assert insert_email("msg4", *sample_emails[0][1:]) is True
+
+    def test_insert_emails_bulk_ignores_duplicates(self, sample_emails):
+        """Test bulk insert skips message IDs that are already stored."""
+        new_email = ("msg4", *sample_emails[0][1:])
+        with patch.object(Database, "get_conn", return_value=self.database_connection):
+            inserted = insert_emails_bulk([sample_emails[0], new_email])
+
+        assert inserted == 1
+        cursor = self.database_connection.cursor()
+        cursor.execute("SELECT COUNT(*) FROM emails")
+        assert cursor.fetchone()[0] == 4
+
     def test_load_rules(self, sample_rules):
         """Test loading rules from JSON file."""
         loaded_rules = load_rules(sample_rules)
@@ -111,34 +310,225 @@ class TestEmailProcessor:
         assert len(loaded_rules[0].conditions) == 2
         assert len(loaded_rules[0].actions) == 2
 
+    @pytest.mark.parametrize("content", [{}, [], {"rules": [{"predicate": "all"}]}])
+    def test_load_rules_invalid_file(self, tmp_path, content):
+        """Test malformed rules files raise a validation error."""
+        rules_file = tmp_path / "bad_rules.json"
+        rules_file.write_text(json.dumps(content))
+
+        with pytest.raises(ValidationError):
+            load_rules(str(rules_file))
+
+    def test_load_rules_reloads_on_change(self, sample_rules):
+        """Test cached rules are reused until the rules file changes."""
+        first = load_rules(sample_rules)
+        assert load_rules(sample_rules)[0] is first[0]
+
+        with open(sample_rules, "w") as f:
+            json.dump({"rules": SAMPLE_RULES_JSON["rules"][:1]}, f)
+        stat = os.stat(sample_rules)
+        os.utime(sample_rules, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        assert len(load_rules(sample_rules)) == 1
+
     def test_email_matches_rule(self):
         """Test rule matching logic."""
-        test_rule_dict = SAMPLE_RULES_JSON["rules"][0]
-        test_rule = Rule.model_validate(test_rule_dict)
+        test_rule = SAMPLE_RULES[0]
 
         assert email_matches_rule(SAMPLE_EMAIL, test_rule) is True
 
-        non_matching_email = SAMPLE_EMAIL.copy()
+        non_matching_email = sample_email()
         non_matching_email["subject"] = "Regular meeting"
         assert email_matches_rule(non_matching_email, test_rule) is False
 
+    def test_match_rules_evaluates_shared_conditions_once(self):
+        """Test identical conditions are evaluated once across rules."""
+        second_rule = Rule.model_validate(
+            {
+                "predicate": "any",
+                "conditions": [{"field": "subject", "contains": "urgent"}],
+                "actions": [],
+            }
+        )
+        rules = [SAMPLE_RULES[0], second_rule]
+
+        with patch("app.helpers._condition_results", wraps=_condition_results) as mock:
+            assert [pos for pos, _ in match_rules(SAMPLE_EMAIL, rules)] == [1, 2]
+
+        checked = [call.args[0].field for call in mock.call_args_list]
+        assert sorted(checked) == ["sender", "subject"]
+
+    def test_rule_condition_precomputes_needle(self):
+        """Test condition match values are lowercased once at validation."""
+        rule = Rule.model_validate(
+            {
+                "predicate": "any",
+                "conditions": [
+                    {"field": "subject", "contains": "URGENT"},
+                    {
+                        "field": "date_received",
+                        "predicate": "is_less_than",
+                        "value": "5",
+                    },
+                    {"field": "sender"},
+                ],
+                "actions": [],
+            }
+        )
+
+        assert [c._needle for c in rule.conditions] == ["urgent", "5", ""]
+
+    def test_match_rules(self):
+        """Test matching an email against a whole rule set."""
+        rules = list(SAMPLE_RULES)
+
+        matches = list(match_rules(SAMPLE_EMAIL, rules))
+
+        assert [position for position, _ in matches] == [1, 3]
+        assert matches[0][1] is rules[0]
+
+    def test_compile_rule_to_sql(self, sample_emails):
+        """Test rules pushed down to SQL select only emails that can match."""
+        rule = Rule.model_validate(
+            {
+                "predicate": "all",
+                "conditions": [
+                    {
+                        "field": "date_received",
+                        "predicate": "is_less_than",
+                        "value": "5",
+                    },
+                    {"field": "subject", "contains": "subject"},
+                ],
+                "actions": [],
+            }
+        )
+        where, params = compile_rule_to_sql(rule)
+
+        cursor = self.database_connection.cursor()
+        cursor.execute(f"SELECT message_id FROM emails WHERE {where}", params)
+        assert [row[0] for row in cursor] == ["msg2"]
+
+    def test_compile_rule_to_sql_keeps_non_ascii_case_folds(self):
+        """Test the SQL filter keeps values str.lower() folds to the needle."""
+        with patch.object(Database, "get_conn", return_value=self.database_connection):
+            insert_emails_bulk(
+                [("msg1", "a@test.com", "\u212aelvin", "2024-01-01", "", "INBOX", 0)]
+            )
+        rule = Rule.model_validate(
+            {
+                "predicate": "all",
+                "conditions": [{"field": "subject", "contains": "kelvin"}],
+                "actions": [],
+            }
+        )
+        assert email_matches_rule(sample_email(subject="\u212aelvin"), rule)
+
+        cursor = self.database_connection.cursor()
+        for fulltext in (False, True):
+            where, params = compile_rule_to_sql(rule, fulltext=fulltext)
+            cursor.execute(f"SELECT message_id FROM emails WHERE {where}", params)
+            assert [row[0] for row in cursor] == ["msg1"]
+
+        # With the full-text index, both branches of the filter use an index.
+        cursor.execute(f"EXPLAIN QUERY PLAN SELECT * FROM emails WHERE {where}", params)
+        plan = [row[3] for row in cursor]
+        assert "SCAN emails" not in plan
+        assert any(step.startswith("SCAN emails_fts VIRTUAL TABLE") for step in plan)
+        assert "SCAN emails USING INDEX idx_emails_subject_ascii_folds" in plan
+
+    def test_match_rules_batch(self):
+        """Test the batch matcher returns one mask per rule over the emails."""
+        old_email = sample_email(
+            subject="Newsletter", date_received=datetime.now() - timedelta(days=30)
+        )
+        plain_email = sample_email(subject=None, sender="a@example.com")
+        emails = [SAMPLE_EMAIL, old_email, plain_email]
+
+        masks = match_rules_batch(emails, list(SAMPLE_RULES))
+
+        assert masks == [
+            [True, False, False],
+            [False, True, False],
+            [True, False, True],
+            [False, False, False],
+        ]
+
+    def test_match_rules_batch_checks_cheap_conditions_first(self):
+        """Test later conditions are only checked on still undecided emails."""
+        rules = [
+            Rule.model_validate(
+                {
+                    "predicate": predicate,
+                    "conditions": [
+                        {"field": "subject", "contains": "urgent"},
+                        {"field": "folder", "contains": "archive"},
+                    ],
+                    "actions": [],
+                }
+            )
+            for predicate in ("all", "any")
+        ]
+        emails = [
+            sample_email(),
+            sample_email(folder="Archive", subject="Weekly digest"),
+            sample_email(folder="Archive"),
+        ]
+
+        with patch("app.helpers._condition_results", wraps=_condition_results) as mock:
+            masks = match_rules_batch(emails, rules)
+
+        assert masks == [[False, False, True], [True, True, True]]
+        checked = [(call.args[0].field, call.args[2]) for call in mock.call_args_list]
+        # The "all" rule checks the cheap folder condition first and the subject
+        # only where it passed. The "any" rule reuses those results and only
+        # checks the subject of the email the folder condition rejected.
+        assert checked == [
+            ("folder", [0, 1, 2]),
+            ("subject", [1, 2]),
+            ("subject", [0]),
+        ]
+
+    def test_match_rules_batch_without_automaton(self):
+        """Test overlapping needles match the same with and without pyahocorasick."""
+        rules = [
+            Rule.model_validate(
+                {
+                    "predicate": "any",
+                    "conditions": [
+                        {"field": "subject", "contains": needle},
+                        {"field": "subject", "contains": "Special Offer"},
+                    ],
+                    "actions": [],
+                }
+            )
+            for needle in ("offer", "deal")
+        ]
+        emails = [
+            sample_email(subject=subject)
+            for subject in ("A special offer", "Best deal", "Offers", None)
+        ]
+
+        masks = match_rules_batch(emails, rules)
+        with patch("app.helpers.ahocorasick", None):
+            assert match_rules_batch(emails, rules) == masks
+        assert masks == [[True, False, True, False], [True, True, False, False]]
+
     @patch("app.helpers.update_email_folder")
     @patch("app.helpers.update_email_read_status")
-    def test_perform_actions(self, mock_update_read, mock_update_folder, capsys):
+    def test_perform_actions(self, mock_update_read, mock_update_folder, caplog):
         """Test action performance with mocked database calls."""
+        caplog.set_level(logging.INFO)
         test_actions = [
             RuleAction(action=ActionType.MARK_READ),
             RuleAction(action=ActionType.MOVE, folder="Important/Urgent"),
         ]
 
         perform_actions(SAMPLE_EMAIL, test_actions)
-        captured_output = capsys.readouterr()
 
-        # Verify output messages
-        assert "Marking email test123 as read" in captured_output.out
-        assert (
-            "Moving email test123 to folder 'Important/Urgent'" in captured_output.out
-        )
+        # Verify log messages
+        assert "Marking email test123 as read" in caplog.text
+        assert "Moving email test123 to folder 'Important/Urgent'" in caplog.text
 
         # Verify mock calls
         mock_update_read.assert_called_once_with(SAMPLE_EMAIL["message_id"], True)
@@ -146,15 +536,39 @@ class TestEmailProcessor:
             SAMPLE_EMAIL["message_id"], "Important/Urgent"
         )
 
+    def test_perform_actions_queues_pending_updates(self, sample_emails):
+        """Test queued actions are written in bulk by flush_updates."""
+        actions = [
+            RuleAction(action=ActionType.MARK_READ),
+            RuleAction(action=ActionType.MOVE, folder="Archive"),
+        ]
+        pending = PendingUpdates()
+        perform_actions({"message_id": "msg1"}, actions, pending)
+        perform_actions({"message_id": "msg3"}, actions[:1], pending)
+
+        assert pending.reads == [(True, "msg1"), (True, "msg3")]
+        assert pending.moves == [("Archive", "msg1")]
+
+        with patch.object(Database, "get_conn", return_value=self.database_connection):
+            flush_updates(pending)
+
+        assert not pending.reads and not pending.moves
+        cursor = self.database_connection.cursor()
+        cursor.execute("SELECT message_id, folder, is_read FROM emails ORDER BY id")
+        assert cursor.fetchall() == [
+            ("msg1", "Archive", 1),
+            ("msg2", "Archive", 1),
+            ("msg3", "INBOX", 1),
+        ]
+
     @patch("app.helpers.update_email_folder")
-    def test_move_action_without_folder(self, mock_update_folder, capsys):
+    def test_move_action_without_folder(self, mock_update_folder, caplog):
         """Test move action without specified folder."""
         test_actions = [RuleAction(action=ActionType.MOVE)]
 
         perform_actions(SAMPLE_EMAIL, test_actions)
-        captured_output = capsys.readouterr()
 
-        assert "No folder specified for move action" in captured_output.out
+        assert "No folder specified for move action" in caplog.text
         mock_update_folder.assert_not_called()
 
     def test_email_matches_rule_with_or_predicate(self):
@@ -171,7 +585,7 @@ class TestEmailProcessor:
 
         assert email_matches_rule(SAMPLE_EMAIL, or_rule) is True
 
-        important_email = SAMPLE_EMAIL.copy()
+        important_email = sample_email()
         important_email["subject"] = "IMPORTANT: Another meeting"
         assert email_matches_rule(important_email, or_rule) is True
 
@@ -199,7 +613,7 @@ class TestEmailProcessor:
 
     def test_display_emails_with_data(self, capsys, sample_emails):
         """Test displaying emails when data exists."""
-        with patch.object(Database, "__enter__", return_value=self.database_connection):
+        with patch.object(Database, "get_conn", return_value=self.database_connection):
             display_emails(limit=2)
             captured = capsys.readouterr()
 
@@ -221,12 +635,49 @@ class TestEmailProcessor:
             assert "sender3@test.com" not in captured.out
             assert "Showing 2 of 3 emails" in captured.out
 
+    def test_process_emails_applies_matching_rules(self, sample_emails):
+        """Test processing only acts on emails matched by the rules."""
+        rules = [
+            Rule.model_validate(
+                {
+                    "predicate": "all",
+                    "conditions": [{"field": "subject", "contains": "subject 1"}],
+                    "actions": [{"action": ActionType.MOVE, "folder": "Matched"}],
+                }
+            ),
+            Rule.model_validate(
+                {
+                    "predicate": "all",
+                    "conditions": [
+                        {
+                            "field": "date_received",
+                            "predicate": "is_less_than",
+                            "value": "7",
+                        }
+                    ],
+                    "actions": [{"action": ActionType.MARK_UNREAD}],
+                }
+            ),
+        ]
+        with (
+            patch.object(Database, "get_conn", return_value=self.database_connection),
+            patch("app.email_processor.load_rules", return_value=rules),
+        ):
+            process_emails()
+
+        cursor = self.database_connection.cursor()
+        cursor.execute("SELECT message_id, folder, is_read FROM emails ORDER BY id")
+        assert cursor.fetchall() == [
+            ("msg1", "Matched", 0),
+            ("msg2", "Archive", 0),
+            ("msg3", "INBOX", 0),
+        ]
+
     def test_display_emails_empty_db(self, capsys):
         """Test displaying emails with empty database."""
         cursor = self.database_connection.cursor()
         cursor.execute("DELETE FROM emails")
-        self.database_connection.commit()
-        with patch.object(Database, "__enter__", return_value=self.database_connection):
+        with patch.object(Database, "get_conn", return_value=self.database_connection):
             display_emails()
             captured = capsys.readouterr()
             assert "No emails found in database." in captured.out
@@ -251,8 +702,7 @@ class TestEmailProcessor:
             """,
             long_email,
         )
-        self.database_connection.commit()
-        with patch.object(Database, "__enter__", return_value=self.database_connection):
+        with patch.object(Database, "get_conn", return_value=self.database_connection):
             display_emails()
         captured = capsys.readouterr()
 
@@ -271,11 +721,11 @@ class TestEmailProcessor:
         }
         test_rule = Rule.model_validate(test_rule_dict)
 
-        recent_email = SAMPLE_EMAIL.copy()
+        recent_email = sample_email()
         recent_email["date_received"] = datetime.now() - timedelta(days=2)
         assert email_matches_rule(recent_email, test_rule) is False
 
-        old_email = SAMPLE_EMAIL.copy()
+        old_email = sample_email()
         old_email["date_received"] = datetime.now() - timedelta(days=10)
         assert email_matches_rule(old_email, test_rule) is True
 
@@ -290,11 +740,33 @@ class TestEmailProcessor:
         }
         test_rule = Rule.model_validate(test_rule_dict)
 
-        old_email = SAMPLE_EMAIL.copy()
+        old_email = sample_email()
         now = datetime.now().astimezone()
         old_email["date_received"] = now - timedelta(days=5)
         assert email_matches_rule(old_email, test_rule) is False
 
-        recent_email = SAMPLE_EMAIL.copy()
+        recent_email = sample_email()
         recent_email["date_received"] = now - timedelta(days=1)
         assert email_matches_rule(recent_email, test_rule) is True
+
+    def test_email_matches_rule_with_fixed_now(self):
+        """Test date conditions are measured from the given timestamp."""
+        test_rule = Rule.model_validate(
+            {
+                "predicate": "all",
+                "conditions": [
+                    {
+                        "field": "date_received",
+                        "predicate": "is_less_than",
+                        "value": "5",
+                    }
+                ],
+                "actions": [],
+            }
+        )
+        email = sample_email()
+        email["date_received"] = datetime(2024, 1, 1, 12, 0).astimezone()
+        received = email["date_received"].timestamp()
+
+        assert email_matches_rule(email, test_rule, now=received + 86400) is False
+        assert email_matches_rule(email, test_rule, now=received + 6 * 86400) is True
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional, TypedDict
 
 
@@ -11,11 +12,15 @@ class EmailDict(TypedDict, total=False):
         subject: Email subject line
         date_received: Email sent date
         snippet: Short preview of email content
+        folder: Folder the email is filed in
+        is_read: Whether the email has been read
     """
 
     id: int
     message_id: str
     sender: Optional[str]
     subject: Optional[str]
-    date_received: Optional[str]
+    date_received: Optional[datetime]
     snippet: Optional[str]
+    folder: str
+    is_read: bool